@@ -0,0 +1,220 @@
+"""Časované scénáře celého zpracování reportu (bez Streamlitu a bez sítě).
+
+Scénáře pokrývají parsování reportu, zpracování pro sdílenou cache (report_store),
+agregaci pozic, stažení cen (přes StubPriceSource), rebalancování, sestavení historie
+a stavbu grafů pro několik velikostí portfolia. Výsledky se ukládají jako JSON do
+benchmarks/results/<label>.json, aby šly porovnat mezi verzemi:
+
+    python -m benchmarks.run --sizes 10 100 1000
+    python -m benchmarks.run --label after --compare benchmarks/results/before.json
+    python -m benchmarks.run --sizes 1000 5000 --scenarios rebalance
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import charts
+import market_data
+import portfolio
+import rebalance
+import report_store
+from benchmarks.stub_source import StubPriceSource
+from benchmarks.xtb_generator import write_report_set
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+HISTORY_PERIOD = '1y'
+BENCH_TODAY = datetime(2024, 1, 2)
+
+
+# Stav sdílený mezi scénáři jedné velikosti portfolia (výstup jednoho kroku je vstupem dalšího)
+class Pipeline:
+    def __init__(self, paths, source):
+        self.paths = paths
+        self.source = source
+        self.start_date, self.end_date = portfolio.history_date_range(HISTORY_PERIOD, BENCH_TODAY)
+
+    def parse_xlsx(self):
+        with open(self.paths['xlsx'], 'rb') as f:
+            self.df_open, self.df_closed, self.df_cash, _ = portfolio.load_report(f, 'report.xlsx')
+
+    def parse_csv(self):
+        for key in ('open_csv', 'closed_csv', 'cash_csv'):
+            with open(self.paths[key], 'rb') as f:
+                portfolio.load_report(f, os.path.basename(self.paths[key]))
+
+    def store(self):
+        with open(self.paths['xlsx'], 'rb') as f:
+            self.report = report_store.parse_report(f.read(), 'report.xlsx')
+
+    def aggregate(self):
+        self.positions = portfolio.calculate_positions(self.df_open)
+        self.total_dividends = portfolio.calculate_total_dividends(self.df_cash)
+        self.total_invested = sum(pos['total_cost'] for pos in self.positions.values())
+        portfolio.build_positions_df(self.positions)
+
+    def pricing(self):
+        self.current_prices, _ = market_data.fetch_current_prices(list(self.positions), source=self.source)
+
+    # Stejně jako aplikace počítá nad sdílenou tabulkou pozic z report_store
+    def metrics(self):
+        self.positions_df, _, _, _ = portfolio.recalculate_positions(
+            report_store.positions_frame(self.report), self.current_prices, self.total_invested
+        )
+        self.positions_df['Kategorie'] = self.positions_df['Název'].apply(portfolio.categorize_asset)
+        self.allocation_df = portfolio.allocation_by_category(self.positions_df)
+
+    # Jeden přepočet při posunu slideru: cíle podle kategorií i podle jednotlivých tickerů
+    def rebalance(self):
+        if not hasattr(self, 'ticker_targets'):
+            rng = np.random.default_rng(0)
+            names = self.positions_df['Název'].to_numpy()
+            self.ticker_targets = dict(zip(names, rng.uniform(0, 1, len(names))))
+        rebalance.compute_rebalance_orders(
+            self.positions_df, {'ETF (EU)': 20, 'Akcie (EU)': 30, 'Akcie (US/Jiné)': 50},
+            by='Kategorie', cash=10000.0,
+        )
+        rebalance.compute_rebalance_orders(
+            self.positions_df, self.ticker_targets, by='Název', cash=10000.0, fractional=False,
+        )
+
+    def history(self):
+        hist_prices = market_data.fetch_historical_prices(
+            list(self.positions_df['Název'].unique()),
+            self.start_date.strftime('%Y-%m-%d'), self.end_date.strftime('%Y-%m-%d'),
+            source=self.source,
+        )
+        self.portfolio_history = portfolio.build_portfolio_history(
+            self.positions_df, hist_prices, self.start_date, self.end_date
+        )
+
+    def figures(self):
+        charts.build_history_figure(self.portfolio_history)
+        charts.build_allocation_figure(self.allocation_df)
+        charts.build_ticker_figure(self.positions_df[self.positions_df['Velikost pozice (USD)'] > 0])
+
+
+# Pořadí odpovídá průchodu aplikací; každý scénář potřebuje výstupy předchozích
+SCENARIOS = ['parse_xlsx', 'parse_csv', 'store', 'aggregate', 'pricing', 'metrics', 'rebalance', 'history', 'figures']
+
+
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+    }
+
+
+def run_benchmarks(sizes, repeat=5, scenarios=None, latency=0.0, lots=3):
+    selected = set(scenarios or SCENARIOS)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            paths = write_report_set(tmp, size, lots_per_symbol=lots)
+            pipeline = Pipeline(paths, StubPriceSource(latency=latency, end_date=BENCH_TODAY))
+            for name in SCENARIOS:
+                step = getattr(pipeline, name)
+                if name not in selected:
+                    step()
+                    continue
+                stats = time_call(step, repeat)
+                results.append({'scenario': name, 'size': size, **stats})
+                print(f"{name:<12} {size:>6} symbolů  median {stats['median_s'] * 1000:10.2f} ms", flush=True)
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _package_versions():
+    versions = {'python': platform.python_version(), 'pandas': pd.__version__}
+    for name in ('numpy', 'plotly', 'openpyxl', 'streamlit'):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return versions
+
+
+def save_results(results, label, out_dir=RESULTS_DIR, latency=0.0):
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{label}.json")
+    payload = {
+        'label': label,
+        'revision': _git_revision(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'versions': _package_versions(),
+        'stub_latency_s': latency,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return path
+
+
+# Porovnání s předchozím během; vrací počet scénářů zpomalených nad threshold
+def compare_results(results, baseline_path, threshold=1.2):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['scenario'], r['size']): r for r in json.load(f)['results']}
+    regressions = 0
+    print(f"\nPorovnání s {baseline_path} (median, poměr nový/starý):")
+    for r in results:
+        old = baseline.get((r['scenario'], r['size']))
+        if old is None or not old['median_s']:
+            continue
+        ratio = r['median_s'] / old['median_s']
+        flag = '  <-- REGRESE' if ratio > threshold else ''
+        if flag:
+            regressions += 1
+        print(f"{r['scenario']:<12} {r['size']:>6}  {old['median_s'] * 1000:10.2f} ms -> "
+              f"{r['median_s'] * 1000:10.2f} ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark zpracování XTB reportu.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='počty symbolů v portfoliu')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=None)
+    parser.add_argument('--lots', type=int, default=3, help='počet otevřených pozic na symbol')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulovaná latence jednoho požadavku (s)')
+    parser.add_argument('--label', default=None, help='název výsledku (výchozí: git revize)')
+    parser.add_argument('--out', default=RESULTS_DIR)
+    parser.add_argument('--compare', default=None, help='JSON s předchozími výsledky')
+    parser.add_argument('--threshold', type=float, default=1.2, help='poměr, od kterého se hlásí regrese')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.scenarios, args.latency, args.lots)
+    label = args.label or _git_revision() or datetime.now().strftime('%Y%m%d-%H%M%S')
+    print(f"\nVýsledky uloženy do {save_results(results, label, args.out, args.latency)}")
+
+    if args.compare:
+        return 1 if compare_results(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
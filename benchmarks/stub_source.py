@@ -0,0 +1,84 @@
+"""Offline náhrada modulu yfinance pro benchmarky.
+
+Implementuje jen to, co používá market_data: download(...)['Close'] a Ticker(t).history(...).
+Ceny jsou deterministické (náhodná procházka se seedem odvozeným z tickeru), takže
+výsledky benchmarků nezávisí na síti ani na stavu trhu. Volitelná latence simuluje
+dobu odezvy Yahoo Finance na jeden požadavek.
+"""
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Přibližné kurzy, kolem kterých se generují FX řady
+FX_LEVELS = {'EURUSD=X': 1.08, 'GBPUSD=X': 1.27}
+
+
+class StubPriceSource:
+    def __init__(self, latency=0.0, end_date=None, missing=()):
+        self.latency = latency
+        self.end_date = pd.Timestamp(end_date or '2024-01-02').normalize()
+        self.missing = set(missing)
+        self.calls = 0
+
+    def _sleep(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _series(self, ticker, index):
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        level = FX_LEVELS.get(ticker)
+        if level is not None:
+            steps = rng.normal(0, 0.003, len(index))
+        else:
+            level = rng.uniform(5, 500)
+            steps = rng.normal(0.0003, 0.015, len(index))
+        return pd.Series(level * np.exp(np.cumsum(steps)), index=index, name=ticker)
+
+    def _index(self, period=None, start=None, end=None):
+        end = pd.Timestamp(end).normalize() if end is not None else self.end_date
+        if start is not None:
+            start = pd.Timestamp(start)
+        else:
+            days = {'1d': 1, '5d': 5, '1mo': 30, '1y': 365}.get(period, 1)
+            start = end - pd.Timedelta(days=days)
+        # Stejně jako u yfinance je konec rozsahu exkluzivní
+        index = pd.bdate_range(start=start, end=end, inclusive='left')
+        if index.empty:
+            index = pd.DatetimeIndex([end])
+        return index
+
+    def download(self, tickers, period=None, start=None, end=None, progress=False, **kwargs):
+        self._sleep()
+        if isinstance(tickers, str):
+            tickers = tickers.split()
+        index = self._index(period, start, end)
+        close = pd.DataFrame(
+            {t: self._series(t, index) if t not in self.missing else np.nan for t in tickers},
+            index=index,
+        )
+        # Stejný tvar jako novější yfinance: MultiIndex sloupců (Price, Ticker)
+        close.columns = pd.MultiIndex.from_product([['Close'], close.columns], names=['Price', 'Ticker'])
+        return close
+
+    def Ticker(self, ticker):
+        return _StubTicker(self, ticker)
+
+
+class _StubTicker:
+    def __init__(self, source, ticker):
+        self.source = source
+        self.ticker = ticker
+
+    def history(self, start=None, end=None, period=None, **kwargs):
+        self.source._sleep()
+        if self.ticker in self.source.missing:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+        index = self.source._index(period, start, end).tz_localize('America/New_York')
+        close = self.source._series(self.ticker, index)
+        return pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': 1000,
+        }, index=index)
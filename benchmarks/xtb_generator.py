@@ -0,0 +1,204 @@
+"""Generátor syntetických XTB reportů (Excel i CSV) pro benchmarky.
+
+Rozložení odpovídá tomu, co očekává portfolio.load_report:
+- listy 'OPEN POSITION', 'CLOSED POSITION' a 'CASH OPERATION',
+- nad tabulkou hlavička účtu, tabulka začíná na řádku 10 ('Position' v prvním sloupci,
+  u uzavřených pozic v Excelu na řádku 9; CSV se čte vždy s header=10),
+  u hotovostních operací je 'ID' ve druhém sloupci,
+- dividendy jsou řádky typu 'DIVIDENT' (tak je píše XTB).
+
+Použití z příkazové řádky:
+    python -m benchmarks.xtb_generator --symbols 200 --out reports/
+"""
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from portfolio import load_report
+
+OPEN_COLUMNS = ['Position', 'Symbol', 'Type', 'Volume', 'Open time', 'Open price',
+                'Market price', 'Purchase value', 'Commission', 'Swap', 'Comment']
+CLOSED_COLUMNS = ['Position', 'Symbol', 'Type', 'Volume', 'Open time', 'Open price',
+                  'Close time', 'Close price', 'Purchase value', 'Sale value',
+                  'Commission', 'Swap', 'Gross P/L', 'Comment']
+CASH_COLUMNS = ['', 'ID', 'Type', 'Time', 'Comment', 'Symbol', 'Amount']
+
+# Řádek s hlavičkou (open, closed, cash) podle formátu - CSV větev load_report čte vždy header=10
+HEADER_ROWS = {
+    'xlsx': (10, 9, 10),
+    'csv': (10, 10, 10),
+}
+
+# Očekávaná hláška load_report pro jednotlivá CSV (kontrola, že je loader správně rozpozná)
+CSV_MESSAGES = {
+    'open_csv': "Načten CSV soubor: Otevřené pozice.",
+    'closed_csv': "Načten CSV soubor: Uzavřené pozice.",
+    'cash_csv': "Načten CSV soubor: Hotovostní operace (pro dividendy).",
+}
+
+# Skutečné symboly z reportů (pokrývají speciální větve get_ticker_and_currency)
+KNOWN_SYMBOLS = ['CSPX.UK', 'CNDX.UK', 'TUI.DE', 'STLAM.IT', 'AAPL.US', 'MSFT.US', 'BP.UK', 'SAP.DE']
+SUFFIXES = ['.US', '.US', '.US', '.DE', '.IT', '.UK']
+
+
+def make_symbols(count, seed=0):
+    rng = random.Random(seed)
+    symbols = KNOWN_SYMBOLS[:count]
+    i = 0
+    while len(symbols) < count:
+        symbols.append(f"SYN{i:04d}{rng.choice(SUFFIXES)}")
+        i += 1
+    return symbols
+
+
+def _account_preamble(rows, width, title):
+    # Hlavička účtu nad tabulkou; řádky nesmí být prázdné (read_csv prázdné řádky přeskakuje)
+    info = [
+        (title, ''), ('Account', '51234567'), ('Name', 'Benchmark Test'),
+        ('Currency', 'USD'), ('Balance', '10000.00'), ('Equity', '10000.00'),
+        ('Margin', '0.00'), ('Free margin', '10000.00'), ('Date', datetime(2024, 1, 2).strftime('%d.%m.%Y')),
+        ('Generated by', 'benchmarks.xtb_generator'), ('', 'x'),
+    ]
+    preamble = [[label, value] + [''] * (width - 2) for label, value in info]
+    return preamble[:rows]
+
+
+def _sheet(columns, records, header_row, title):
+    rows = _account_preamble(header_row, len(columns), title)
+    rows.append(list(columns))
+    rows.extend([[record.get(c, '') for c in columns] for record in records])
+    return pd.DataFrame(rows)
+
+
+def generate_report_records(n_symbols, lots_per_symbol=3, n_closed=None, dividends_per_symbol=2, seed=0):
+    """Vrátí (open_records, closed_records, cash_records) jako seznamy slovníků."""
+    rng = random.Random(seed)
+    symbols = make_symbols(n_symbols, seed)
+    start = datetime(2020, 1, 2)
+    position_id = 100000000
+
+    open_records = []
+    for symbol in symbols:
+        base_price = rng.uniform(5, 500)
+        for _ in range(lots_per_symbol):
+            position_id += 1
+            volume = round(rng.uniform(0.1, 50), 4)
+            open_price = round(base_price * rng.uniform(0.8, 1.2), 2)
+            open_records.append({
+                'Position': position_id, 'Symbol': symbol, 'Type': 'BUY', 'Volume': volume,
+                'Open time': (start + timedelta(days=rng.randint(0, 1400))).strftime('%d.%m.%Y %H:%M:%S'),
+                'Open price': open_price, 'Market price': round(base_price, 2),
+                'Purchase value': round(volume * open_price, 2),
+                'Commission': 0.0, 'Swap': 0.0, 'Comment': '',
+            })
+
+    closed_records = []
+    for _ in range(n_symbols if n_closed is None else n_closed):
+        position_id += 1
+        symbol = rng.choice(symbols)
+        volume = round(rng.uniform(0.1, 20), 4)
+        open_price = round(rng.uniform(5, 500), 2)
+        close_price = round(open_price * rng.uniform(0.7, 1.5), 2)
+        opened = start + timedelta(days=rng.randint(0, 1000))
+        closed_records.append({
+            'Position': position_id, 'Symbol': symbol, 'Type': 'BUY', 'Volume': volume,
+            'Open time': opened.strftime('%d.%m.%Y %H:%M:%S'), 'Open price': open_price,
+            'Close time': (opened + timedelta(days=rng.randint(1, 300))).strftime('%d.%m.%Y %H:%M:%S'),
+            'Close price': close_price, 'Purchase value': round(volume * open_price, 2),
+            'Sale value': round(volume * close_price, 2), 'Commission': 0.0, 'Swap': 0.0,
+            'Gross P/L': round(volume * (close_price - open_price), 2), 'Comment': '',
+        })
+
+    cash_records = []
+    operation_id = 500000000
+    for symbol in symbols:
+        for _ in range(dividends_per_symbol):
+            operation_id += 1
+            amount = round(rng.uniform(0.5, 40), 2)
+            when = (start + timedelta(days=rng.randint(0, 1400))).strftime('%d.%m.%Y %H:%M:%S')
+            cash_records.append({'ID': operation_id, 'Type': 'DIVIDENT', 'Time': when,
+                                 'Comment': f"{symbol} USD 0.2400/ SHR", 'Symbol': symbol, 'Amount': amount})
+            operation_id += 1
+            cash_records.append({'ID': operation_id, 'Type': 'WITHHOLDING TAX', 'Time': when,
+                                 'Comment': f"{symbol} USD WHT 15%", 'Symbol': symbol, 'Amount': -round(amount * 0.15, 2)})
+    for record in open_records:
+        operation_id += 1
+        cash_records.append({'ID': operation_id, 'Type': 'Stocks/ETF purchase', 'Time': record['Open time'],
+                             'Comment': f"OPEN BUY {record['Volume']} @ {record['Open price']}",
+                             'Symbol': record['Symbol'], 'Amount': -record['Purchase value']})
+    operation_id += 1
+    cash_records.insert(0, {'ID': operation_id, 'Type': 'deposit', 'Time': start.strftime('%d.%m.%Y %H:%M:%S'),
+                            'Comment': 'Deposit', 'Symbol': '', 'Amount': sum(r['Purchase value'] for r in open_records)})
+
+    return open_records, closed_records, cash_records
+
+
+def generate_report_frames(records, file_format='xlsx'):
+    """Vrátí (open_sheet, closed_sheet, cash_sheet) jako DataFrame bez hlavičky ve formátu XTB."""
+    open_records, closed_records, cash_records = records
+    open_row, closed_row, cash_row = HEADER_ROWS[file_format]
+    return (
+        _sheet(OPEN_COLUMNS, open_records, open_row, 'OPEN POSITION'),
+        _sheet(CLOSED_COLUMNS, closed_records, closed_row, 'CLOSED POSITION'),
+        _sheet(CASH_COLUMNS, cash_records, cash_row, 'CASH OPERATION'),
+    )
+
+
+def write_xlsx(path, frames):
+    open_sheet, closed_sheet, cash_sheet = frames
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        open_sheet.to_excel(writer, sheet_name='OPEN POSITION 02012024', header=False, index=False)
+        closed_sheet.to_excel(writer, sheet_name='CLOSED POSITION HISTORY', header=False, index=False)
+        cash_sheet.to_excel(writer, sheet_name='CASH OPERATION HISTORY', header=False, index=False)
+    return path
+
+
+def write_csv(path, sheet):
+    sheet.to_csv(path, header=False, index=False)
+    return path
+
+
+# Zapíše kompletní sadu reportů (xlsx + samostatná CSV) do adresáře a vrátí cesty k souborům
+def write_report_set(out_dir, n_symbols, **kwargs):
+    os.makedirs(out_dir, exist_ok=True)
+    records = generate_report_records(n_symbols, **kwargs)
+    csv_frames = generate_report_frames(records, 'csv')
+    prefix = os.path.join(out_dir, f"xtb_{n_symbols}")
+    paths = {
+        'xlsx': write_xlsx(prefix + '.xlsx', generate_report_frames(records, 'xlsx')),
+        'open_csv': write_csv(prefix + '_open.csv', csv_frames[0]),
+        'closed_csv': write_csv(prefix + '_closed.csv', csv_frames[1]),
+        'cash_csv': write_csv(prefix + '_cash.csv', csv_frames[2]),
+    }
+    check_csv_classification(paths)
+    return paths
+
+
+# Ověří, že load_report rozpozná každé CSV jako správný typ reportu (ne záložní větev)
+def check_csv_classification(paths):
+    for key, expected in CSV_MESSAGES.items():
+        with open(paths[key], 'rb') as f:
+            messages = load_report(f, os.path.basename(paths[key]))[3]
+        if ('success', expected) not in messages:
+            raise ValueError(f"{paths[key]}: load_report nerozpoznal CSV správně ({messages})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Vygeneruje syntetické XTB reporty.')
+    parser.add_argument('--symbols', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--lots', type=int, default=3, help='počet otevřených pozic na symbol')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='synthetic_reports')
+    args = parser.parse_args(argv)
+
+    for n_symbols in args.symbols:
+        paths = write_report_set(args.out, n_symbols, lots_per_symbol=args.lots, seed=args.seed)
+        for path in paths.values():
+            print(path)
+
+
+if __name__ == '__main__':
+    main()
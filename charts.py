@@ -0,0 +1,68 @@
+import plotly.express as px
+
+# --- Sestavení Plotly grafů (sjednocený černý motiv) ---
+
+PLOTLY_BG_COLOR = '#000000'
+
+
+# Historický vývoj hodnoty portfolia (Line Chart)
+def build_history_figure(portfolio_history):
+    fig_hist = px.line(
+        portfolio_history.reset_index(),
+        x='index',
+        y='Celková hodnota',
+        title='Historický vývoj hodnoty portfolia',
+        labels={'index': 'Datum', 'Celková hodnota': 'Hodnota (USD)'},
+        template='plotly_dark'
+    )
+
+    # Sjednocené pozadí grafu - ČISTĚ ČERNÁ
+    fig_hist.update_layout(
+        plot_bgcolor=PLOTLY_BG_COLOR,
+        paper_bgcolor=PLOTLY_BG_COLOR,
+        font=dict(color="#fafafa"),
+        margin=dict(t=50, b=50, l=50, r=50)
+    )
+    return fig_hist
+
+
+# Společné nastavení koláčových grafů (Donut Charts)
+def _style_donut(fig):
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hole=.4
+    )
+    fig.update_layout(
+        plot_bgcolor=PLOTLY_BG_COLOR,
+        paper_bgcolor=PLOTLY_BG_COLOR,
+        font=dict(color="#fafafa"),
+        showlegend=True,
+        margin=dict(t=30, b=0, l=0, r=0)
+    )
+    return fig
+
+
+# Alokace: ETF vs. Akcie
+def build_allocation_figure(allocation_df):
+    fig_allocation = px.pie(
+        allocation_df,
+        values='Velikost pozice (USD)',
+        names='Kategorie',
+        title='**Alokace: ETF vs. Akcie**',
+        template='plotly_dark'
+    )
+    return _style_donut(fig_allocation)
+
+
+# Rozdělení podle jednotlivých tickerů
+def build_ticker_figure(pie_data):
+    fig_ticker = px.pie(
+        pie_data,
+        values='Velikost pozice (USD)',
+        names='Název',
+        title='**Rozdělení podle Tickeru**',
+        hover_data=['Velikost pozice (USD)', 'Nerealizovaný % Zisk'],
+        template='plotly_dark'
+    )
+    return _style_donut(fig_ticker)
@@ -0,0 +1,150 @@
+import pandas as pd
+import streamlit as st
+
+from portfolio import get_ticker_and_currency
+
+# --- Stahování tržních dat ---
+# Funkce fetch_* přijímají zdroj dat (výchozí je modul yfinance), aby šly spustit i offline
+# (benchmarky používají benchmarks.stub_source). Varování nevypisují přímo, ale vrací je
+# jako seznam (úroveň, text) - zobrazí je až cachované obálky get_* na konci souboru.
+
+
+# yfinance se importuje až při prvním stahování (zrychluje studený start aplikace)
+def _default_source(source):
+    if source is None:
+        import yfinance as yf
+        return yf
+    return source
+
+
+# Měny (kromě USD), ve kterých se obchodují dané symboly - seřazené kvůli stabilnímu klíči cache
+def currencies_for(symbols):
+    return tuple(sorted(set(get_ticker_and_currency(s)[1] for s in symbols) - {'USD'}))
+
+
+# Aktuální kurzy měn vůči USD
+def fetch_fx_rates(currencies, source=None):
+    source = _default_source(source)
+    messages = []
+    currency_rates = {'USD': 1.0}
+    currency_tickers = [f"{curr}USD=X" for curr in currencies if curr != 'USD']
+
+    # Původní, méně agresivní ošetření chyb pro aktuální ceny
+    if currency_tickers:
+        try:
+            rates_data = source.download(currency_tickers, period='1d', progress=False)['Close']
+            if isinstance(rates_data, pd.Series):
+                currency = currency_tickers[0].split('USD=X')[0]
+                currency_rates[currency] = rates_data.iloc[-1]
+            else:
+                for curr_ticker in currency_tickers:
+                    currency = curr_ticker.split('USD=X')[0]
+                    rate = rates_data[curr_ticker].iloc[-1] if not rates_data[curr_ticker].empty else 1.0
+                    currency_rates[currency] = rate
+        except Exception:
+            messages.append(('warning', "Problém se stažením kurzu, používám výchozí 1.0."))
+
+    return currency_rates, messages
+
+
+# Funkce pro stažení aktuálních cen (batch processing)
+# Kurzy lze předat (currency_rates), jinak se stáhnou spolu s cenami.
+def fetch_current_prices(symbols, source=None, currency_rates=None):
+    source = _default_source(source)
+    messages = []
+    if not symbols:
+        return {}, messages
+    ticker_map = {symbol: get_ticker_and_currency(symbol) for symbol in symbols}
+    yf_tickers = [v[0] for v in ticker_map.values()]
+    if currency_rates is None:
+        currency_rates, messages = fetch_fx_rates(currencies_for(symbols), source)
+
+    prices = {}
+
+    try:
+        data = source.download(yf_tickers, period='1d', progress=False)['Close']
+        if isinstance(data, pd.Series):
+            ticker = yf_tickers[0]
+            price = data.iloc[-1]
+            for symbol, (t, curr) in ticker_map.items():
+                if t == ticker:
+                    prices[symbol] = price * currency_rates.get(curr, 1.0)
+                    break
+        else:
+            for symbol, (ticker, currency) in ticker_map.items():
+                try:
+                    price = data[ticker].iloc[-1]
+                    prices[symbol] = price * currency_rates.get(currency, 1.0)
+                except (KeyError, IndexError):
+                    prices[symbol] = 0
+    except Exception:
+        messages.append(('error', "Nepodařilo se stáhnout ceny pro jeden nebo více symbolů (pravděpodobně chyba Yahoo Finance). Používám 0 pro chybějící data."))
+        for symbol in symbols:
+            prices[symbol] = 0
+
+    return prices, messages
+
+
+# Historická data převedená do USD
+def fetch_historical_prices(symbols, start_date, end_date, source=None):
+    source = _default_source(source)
+    hist_prices = {}
+    currencies = set(get_ticker_and_currency(s)[1] for s in symbols if get_ticker_and_currency(s)[1] != 'USD')
+    hist_rates = {}
+    currency_tickers = [f"{curr}USD=X" for curr in currencies]
+
+    if currency_tickers:
+        try:
+            rates_df = source.download(currency_tickers, start=start_date, end=end_date, progress=False)['Close']
+            if isinstance(rates_df, pd.Series):
+                currency = currency_tickers[0].split('USD=X')[0]
+                hist_rates[currency] = rates_df.ffill()
+            else:
+                for curr in currencies:
+                    ticker = f"{curr}USD=X"
+                    hist_rates[curr] = rates_df[ticker].ffill()
+        except Exception:
+            pass
+
+    for symbol in symbols:
+        ticker, currency = get_ticker_and_currency(symbol)
+        try:
+            # Původní metoda Ticker().history()
+            df = source.Ticker(ticker).history(start=start_date, end=end_date)
+            prices = df['Close'].ffill()
+            if currency != 'USD' and currency in hist_rates:
+                rates = hist_rates[currency].reindex(prices.index, method='ffill')
+                prices = prices * rates
+            hist_prices[symbol] = prices
+
+        except Exception:
+            hist_prices[symbol] = pd.Series(dtype=float)
+
+    return hist_prices
+
+
+def _show_messages(messages):
+    for level, text in messages:
+        getattr(st, level)(text)
+
+
+# Kurzy měn s cachingem (10 minut) - samostatně, aby je šlo přednačíst při startu serveru
+@st.cache_data(ttl=600)
+def get_fx_rates(currencies):
+    currency_rates, messages = fetch_fx_rates(currencies)
+    _show_messages(messages)
+    return currency_rates
+
+
+# Aktuální ceny s cachingem (10 minut); symboly předávejte seřazené, ať se trefí i přednačtená data
+@st.cache_data(ttl=600)
+def get_current_prices(symbols):
+    prices, messages = fetch_current_prices(symbols, currency_rates=get_fx_rates(currencies_for(symbols)))
+    _show_messages(messages)
+    return prices
+
+
+# Historická data s cachingem (1 hodina)
+@st.cache_data(ttl=3600)
+def get_historical_prices(symbols, start_date, end_date):
+    return fetch_historical_prices(symbols, start_date, end_date)
@@ -0,0 +1,202 @@
+import pandas as pd
+import numpy as np
+
+# --- Zpracování XTB reportu a výpočty portfolia (bez závislosti na Streamlitu) ---
+
+
+# Funkce pro mapování XTB symbolů na yfinance tickery a měny
+def get_ticker_and_currency(symbol):
+    symbol_upper = symbol.upper()
+
+    if symbol_upper == 'CSPX.UK' or symbol_upper == 'CSPX':
+        return 'CSPX.L', 'USD'
+    if symbol_upper == 'CNDX.UK' or symbol_upper == 'CNDX':
+        return 'CNDX.L', 'USD'
+    if 'TUI' in symbol_upper and symbol_upper.endswith('.DE'):
+        return 'TUI1.DE', 'EUR'
+    elif symbol_upper.endswith('.US'):
+        return symbol_upper[:-3], 'USD'
+    elif symbol_upper.endswith('.DE'):
+        return symbol_upper[:-3] + '.DE', 'EUR'
+    elif symbol_upper.endswith('.IT'):
+        return symbol_upper[:-3] + '.MI', 'EUR'
+    elif symbol_upper.endswith('.UK'):
+        return symbol_upper[:-3] + '.L', 'GBP'
+    return symbol, 'USD'
+
+
+# Načtení listu s robustním hledáním řádku s hlavičkou (XTB má nad tabulkou hlavičku účtu)
+def _read_sheet(source, sheet_name, header_column, header_value, default_header):
+    df_full = pd.read_excel(source, sheet_name=sheet_name, header=None)
+    header_index = df_full[df_full.iloc[:, header_column].astype(str) == header_value].index.min()
+    if pd.isna(header_index):
+        header_index = default_header
+    return pd.read_excel(source, sheet_name=sheet_name, header=header_index).dropna(how='all')
+
+
+# Načtení Excel/CSV reportu z XTB
+# Vrací (df_open, df_closed, df_cash, messages), kde messages je seznam (úroveň, text) pro zobrazení v UI.
+def load_report(source, file_name):
+    df_open = pd.DataFrame()
+    df_closed = pd.DataFrame() # Bude sice stále načten pro kompatibilitu, ale nepoužit pro zisk
+    df_cash = pd.DataFrame() # DataFrame pro hotovostní operace (dividendy)
+    messages = []
+
+    if file_name.endswith('.xlsx'):
+        excel = pd.ExcelFile(source)
+        sheets = excel.sheet_names
+        open_sheet = next((s for s in sheets if 'OPEN POSITION' in s.upper()), None)
+        closed_sheet = next((s for s in sheets if 'CLOSED POSITION' in s.upper()), None)
+        cash_sheet = next((s for s in sheets if 'CASH OPERATION' in s.upper()), None)
+
+        if open_sheet:
+            df_open = _read_sheet(source, open_sheet, 0, 'Position', 10)
+
+        if closed_sheet:
+            df_closed = _read_sheet(source, closed_sheet, 0, 'Position', 9)
+
+        # NAČTENÍ CASH OPERATION HISTORY (hlavička 'ID' je ve druhém sloupci)
+        if cash_sheet:
+            df_cash = _read_sheet(source, cash_sheet, 1, 'ID', 10)
+            messages.append(('success', "Načtena historie hotovostních operací (pro dividendy)."))
+
+    else: # HANDLING CSV FILES
+        df_temp = pd.read_csv(source, header=10).dropna(how='all')
+
+        # Zjednodušená detekce pro CSV
+        if 'Gross P/L' in df_temp.columns and 'Position' in df_temp.columns:
+            df_closed = df_temp
+            messages.append(('success', "Načten CSV soubor: Uzavřené pozice."))
+
+        elif 'Purchase value' in df_temp.columns and 'Volume' in df_temp.columns:
+            df_open = df_temp
+            messages.append(('success', "Načten CSV soubor: Otevřené pozice."))
+
+        elif 'Type' in df_temp.columns and 'Amount' in df_temp.columns and 'DIVIDENT' in df_temp['Type'].astype(str).unique():
+            df_cash = df_temp
+            messages.append(('success', "Načten CSV soubor: Hotovostní operace (pro dividendy)."))
+
+        else:
+            messages.append(('warning', "Načten CSV soubor, ale nebyl rozpoznán jako standardní report. Zkusíme jej zpracovat jako Otevřené pozice."))
+            df_open = df_temp
+
+    return df_open, df_closed, df_cash, messages
+
+
+# Funkce pro výpočet otevřených pozic (statická data z reportu)
+def calculate_positions(transactions):
+    positions = {}
+    for _, row in transactions.iterrows():
+        if pd.isna(row['Symbol']): continue
+        symbol = row['Symbol']
+        quantity = row['Volume']
+        purchase_value = row['Purchase value']
+        transaction_type = row['Type']
+        if symbol not in positions:
+            positions[symbol] = {'quantity': 0, 'total_cost': 0}
+        if 'BUY' in transaction_type.upper():
+            positions[symbol]['quantity'] += quantity
+            positions[symbol]['total_cost'] += purchase_value
+    for symbol in positions:
+        if positions[symbol]['quantity'] > 0:
+            positions[symbol]['avg_price'] = positions[symbol]['total_cost'] / positions[symbol]['quantity']
+        else:
+            positions[symbol]['avg_price'] = 0
+    return {k: v for k, v in positions.items() if v['quantity'] > 0}
+
+
+# Součet vyplacených dividend z hotovostních operací (řádky typu 'DIVIDENT')
+def calculate_total_dividends(df_cash):
+    if 'Type' in df_cash.columns and 'Amount' in df_cash.columns:
+        dividends_df = df_cash[df_cash['Type'].astype(str).str.upper().str.contains('DIVIDENT', na=False)]
+        # Suma je v USD, protože report je v USD
+        return dividends_df['Amount'].sum() if not dividends_df.empty else 0
+    return 0
+
+
+# Statická část tabulky pozic (z reportu, bez aktuálních cen)
+def build_positions_df(positions):
+    return pd.DataFrame({
+        'Název': list(positions.keys()),
+        'Množství': [pos['quantity'] for pos in positions.values()],
+        'Průměrná cena (USD)': [pos['avg_price'] for pos in positions.values()],
+        'Náklad pozice (USD)': [pos['avg_price'] * pos['quantity'] for pos in positions.values()],
+    })
+
+
+# Přepočet metrik pozic z aktuálních cen
+# base_df se nemění (může být sdílený mezi sessions), vrací se jeden nový DataFrame.
+# Vrací (positions_df, total_portfolio_value, unrealized_profit, unrealized_profit_pct)
+def recalculate_positions(base_df, current_prices, total_invested):
+    qty = base_df['Množství']
+    avg_price = base_df['Průměrná cena (USD)']
+    cost = base_df['Náklad pozice (USD)']
+    # Název může být category - map pak vrací category, proto nejdřív převod na float
+    current_price = base_df['Název'].map(current_prices).astype(float).fillna(0)
+
+    position_value = qty * current_price
+    profit = (current_price - avg_price) * qty
+
+    total_portfolio_value = position_value.sum()
+    unrealized_profit = profit.sum()
+    unrealized_profit_pct = (unrealized_profit / total_invested * 100) if total_invested > 0 else 0
+
+    positions_df = pd.DataFrame({
+        'Název': base_df['Název'],
+        'Množství': qty,
+        'Průměrná cena (USD)': avg_price,
+        'Aktuální cena (USD)': current_price,
+        'Velikost pozice (USD)': position_value,
+        'Nerealizovaný Zisk (USD)': profit,
+        'Nerealizovaný % Zisk': (profit / cost * 100).fillna(0),
+        'Náklad pozice (USD)': cost,
+        '% v portfoliu': position_value / total_portfolio_value * 100 if total_portfolio_value > 0 else 0.0,
+    })
+    return positions_df, total_portfolio_value, unrealized_profit, unrealized_profit_pct
+
+
+# Převod zvoleného horizontu grafu na rozsah dat
+def history_date_range(period, today):
+    delta_map = {'3m': 90, '6m': 180, '1y': 365, '2y': 365*2, '5y': 365*5, 'max': 365*10}
+    days = delta_map.get(period, 365)
+    return today - pd.Timedelta(days=days), today
+
+
+# Sestavení denní historie hodnoty portfolia z historických cen
+def build_portfolio_history(positions_df, hist_prices, start_date, end_date):
+    portfolio_history = pd.DataFrame(index=pd.to_datetime(pd.date_range(start=start_date, end=end_date)))
+
+    for symbol in positions_df['Název'].unique():
+        # Ošetření, pokud pozice neexistuje nebo je 0
+        pos_data = positions_df[positions_df['Název'] == symbol]
+        if pos_data.empty: continue
+
+        pos = pos_data.iloc[0]
+        qty = pos['Množství']
+        if qty == 0: continue
+
+        if symbol in hist_prices and not hist_prices[symbol].empty:
+            prices = hist_prices[symbol].tz_localize(None)
+            prices = prices.reindex(portfolio_history.index, method='ffill')
+            portfolio_history[symbol] = prices * qty
+
+    portfolio_history['Celková hodnota'] = portfolio_history.sum(axis=1).replace(0, np.nan).ffill()
+    return portfolio_history
+
+
+# Rozdělení na ETF vs. Akcie (Stocks)
+def categorize_asset(symbol):
+    symbol_upper = symbol.upper()
+    # Explicitně identifikujeme ETF (CSPX, CNDX), zbytek s evropskou koncovkou budou Akcie EU.
+    if 'CSPX' in symbol_upper or 'CNDX' in symbol_upper:
+        return 'ETF (EU)'
+    elif symbol_upper.endswith('.UK') or symbol_upper.endswith('.DE') or symbol_upper.endswith('.IT'):
+        return 'Akcie (EU)' # Sem spadne TUI a Stellantis
+    else:
+        return 'Akcie (US/Jiné)'
+
+
+# Součet hodnoty pozic podle kategorie (pro koláčový graf alokace)
+def allocation_by_category(positions_df):
+    allocation_df = positions_df.groupby('Kategorie')['Velikost pozice (USD)'].sum().reset_index()
+    return allocation_df[allocation_df['Velikost pozice (USD)'] > 0]
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import startup
+
+# --- Přednačtení cache při startu serveru ---
+# Spouští se jednou za proces v samostatném vlákně - při `python serve.py` hned při startu
+# serveru, při `streamlit run app.py` z prvního běhu app.py. Jakmile běží Streamlit runtime,
+# naimportuje těžké knihovny a naplní st.cache_data (kurzy, aktuální ceny, historii) pro sledovaný
+# watchlist a pro naposledy zobrazená portfolia, takže první návštěvník po nasazení
+# nečeká na stahování z Yahoo Finance.
+#
+# Nastavení přes proměnné prostředí:
+#   ALFA_PREWARM=0                      vypne přednačtení
+#   ALFA_PREWARM_WATCHLIST=AAPL.US,...  XTB symboly sledovaného portfolia (např. "domácí" report)
+#   ALFA_PREWARM_HISTORY=1y             horizont historického grafu k přednačtení ('' = nepřednačítat)
+#   ALFA_PREWARM_STATE=<soubor>         kam se ukládají naposledy zobrazená portfolia
+
+STATE_PATH = os.environ.get(
+    'ALFA_PREWARM_STATE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'last_seen_portfolios.json'),
+)
+MAX_REMEMBERED = 5
+RUNTIME_WAIT_S = 60
+
+_state_lock = threading.Lock()
+_start_lock = threading.Lock()
+_prewarm_thread = None
+
+
+def is_enabled():
+    return os.environ.get('ALFA_PREWARM', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def load_watchlist():
+    raw = os.environ.get('ALFA_PREWARM_WATCHLIST', '')
+    return tuple(sorted(s.strip() for s in raw.split(',') if s.strip()))
+
+
+def load_last_seen():
+    try:
+        with open(STATE_PATH, encoding='utf-8') as f:
+            return [tuple(symbols) for symbols in json.load(f)]
+    except (OSError, ValueError):
+        return []
+
+
+# Zapamatuje si symboly zobrazeného portfolia pro přednačtení po dalším startu
+def remember_portfolio(symbols):
+    symbols = tuple(sorted(symbols))
+    if not symbols:
+        return
+    with _state_lock:
+        seen = [s for s in load_last_seen() if s != symbols]
+        seen.insert(0, symbols)
+        try:
+            os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+            with open(STATE_PATH, 'w', encoding='utf-8') as f:
+                json.dump([list(s) for s in seen[:MAX_REMEMBERED]], f)
+        except OSError as e:
+            startup.logger().warning("Nelze uložit naposledy zobrazená portfolia: %s", e)
+
+
+# Seznam portfolií (seřazené n-tice symbolů) k přednačtení, bez duplicit
+def portfolios_to_prewarm():
+    portfolios = []
+    for symbols in [load_watchlist()] + load_last_seen():
+        if symbols and symbols not in portfolios:
+            portfolios.append(symbols)
+    return portfolios
+
+
+def prewarm(portfolios, history_period=None):
+    with startup.phase('prewarm imports'):
+        import charts  # noqa: F401 - jen kvůli načtení plotly do paměti
+        import market_data
+        import portfolio
+        import yfinance  # noqa: F401
+
+    with startup.phase('prewarm fx'):
+        for currencies in dict.fromkeys(market_data.currencies_for(symbols) for symbols in portfolios):
+            market_data.get_fx_rates(currencies)
+
+    with startup.phase('prewarm quotes'):
+        for symbols in portfolios:
+            market_data.get_current_prices(symbols)
+
+    if history_period:
+        with startup.phase('prewarm history'):
+            start_date, end_date = portfolio.history_date_range(history_period, datetime.now())
+            for symbols in portfolios:
+                market_data.get_historical_prices(
+                    list(symbols), start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+                )
+
+
+def _run_when_ready():
+    from streamlit.runtime import Runtime
+
+    # Cache musí vzniknout až v běžícím runtime, jinak by Streamlit použil dočasné úložiště
+    deadline = time.monotonic() + RUNTIME_WAIT_S
+    while not Runtime.exists():
+        if time.monotonic() > deadline:
+            startup.logger().warning("Streamlit runtime se nespustil, přednačtení přeskočeno.")
+            return
+        time.sleep(0.1)
+
+    portfolios = portfolios_to_prewarm()
+    try:
+        prewarm(portfolios, os.environ.get('ALFA_PREWARM_HISTORY', '1y'))
+    except Exception as e:
+        startup.logger().warning("Přednačtení dat selhalo: %s", e)
+        return
+    startup.log_summary(f"Přednačtení dokončeno ({len(portfolios)} portfolií)")
+
+
+# Spustí přednačtení na pozadí (server mezitím normálně startuje); další volání nic nedělají
+def start_in_background():
+    global _prewarm_thread
+    if not is_enabled():
+        return None
+    with _start_lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(target=_run_when_ready, name='alfa-prewarm', daemon=True)
+            _prewarm_thread.start()
+    return _prewarm_thread
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+# --- Rebalancování portfolia podle cílových vah ---
+# Výpočet je vektorový nad tabulkou pozic (numpy), takže se dá přepočítávat při každém
+# posunu slideru i pro tisíce pozic. Rozdíl každé skupiny se soustředí do co nejmenšího
+# počtu pozic: prodává se od největších pozic skupiny, dokud se rozdíl nevyčerpá, a nakupuje
+# se do jediné (největší) pozice skupiny. Většina pozic tak žádný příkaz nedostane.
+
+FRACTIONAL_STEP = 0.0001 # XTB zobrazuje frakční množství na 4 desetinná místa
+WHOLE_SHARE_STEP = 1.0
+
+
+# Zaokrouhlení množství směrem k nule na násobek kroku (nikdy nepřekročí rozpočet ani držbu)
+def _truncate(quantity, step):
+    return np.trunc(np.round(quantity / step, 9)) * step
+
+
+# Aktuální váhy skupin v % (výchozí hodnoty pro zadávání cílů)
+def current_weights(positions_df, by='Kategorie'):
+    values = positions_df.groupby(by, sort=True)['Velikost pozice (USD)'].sum()
+    total = values.sum()
+    return values / total * 100 if total > 0 else values * 0.0
+
+
+# Výpočet příkazů k rebalancování
+# targets: {skupina: cílová váha} (libovolné kladné jednotky, normalizují se na 100 %; skupiny
+#          bez cíle mají cíl 0), by: 'Kategorie' nebo 'Název', cash: volná hotovost k investování.
+# Vrací (orders_df, groups_df, remaining_cash).
+def compute_rebalance_orders(positions_df, targets, by='Kategorie', cash=0.0, fractional=True,
+                             allow_sell=True, min_order_value=0.0):
+    step = FRACTIONAL_STEP if fractional else WHOLE_SHARE_STEP
+    cash = max(float(cash), 0.0)
+
+    price = positions_df['Aktuální cena (USD)'].to_numpy(dtype=float)
+    quantity = positions_df['Množství'].to_numpy(dtype=float)
+    priced = price > 0
+    value = np.where(priced, quantity * price, 0.0)
+
+    codes, groups = pd.factorize(positions_df[by], sort=True)
+    n_groups = len(groups)
+    group_value = np.bincount(codes, weights=value, minlength=n_groups)
+    group_priced = np.bincount(codes, weights=priced.astype(float), minlength=n_groups)
+
+    weights = pd.Series(targets, dtype=float).reindex(groups).fillna(0).clip(lower=0).to_numpy()
+    # Skupina bez jediné ocenitelné pozice nejde koupit - její cíl se rozdělí mezi ostatní
+    weights = np.where(group_priced > 0, weights, 0.0)
+    if weights.sum() > 0:
+        weights = weights / weights.sum()
+
+    total = value.sum() + cash
+    group_delta = weights * total - group_value if weights.sum() > 0 else np.zeros(n_groups)
+    if not allow_sell:
+        group_delta = np.clip(group_delta, 0, None)
+        needed = group_delta.sum()
+        if needed > cash:
+            group_delta *= cash / needed
+
+    # Pořadí uvnitř skupiny: ocenitelné pozice první, pak od největší hodnoty
+    order = np.lexsort((-value, ~priced, codes))
+    sorted_codes = codes[order]
+    sorted_value = value[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    # Hodnota větších pozic téže skupiny před danou pozicí (kumulativní plnění)
+    cumulative = np.cumsum(sorted_value)
+    group_offset = np.zeros(n_groups)
+    group_offset[sorted_codes[starts]] = cumulative[starts] - sorted_value[starts]
+    value_before = np.empty_like(value)
+    value_before[order] = cumulative - sorted_value - group_offset[sorted_codes]
+
+    # Pozice, do které skupina nakupuje (největší ocenitelná), -1 = skupina nejde koupit
+    buy_row = np.full(n_groups, -1)
+    first_rows = order[starts]
+    buy_row[sorted_codes[starts]] = np.where(priced[first_rows], first_rows, -1)
+
+    # Prodeje: od největší pozice, dokud se nevyčerpá přebytek skupiny; nejvýše držené množství
+    excess = np.clip(-group_delta, 0, None)[codes]
+    sell_value = np.clip(excess - value_before, 0, value)
+    sell_quantity = np.divide(sell_value, price, out=np.zeros_like(price), where=priced)
+    sell = -np.minimum(_truncate(sell_quantity, step), quantity)
+    sell = np.where(-sell * price < min_order_value, 0.0, sell)
+    budget = cash - (sell * price).sum()
+
+    # Nákupy: celý nedostatek skupiny do její nákupní pozice; když by rozpočet nestačil
+    # (zaokrouhlení prodejů), všechny nákupy se poměrně zmenší
+    shortfall = np.where(buy_row >= 0, np.clip(group_delta, 0, None), 0.0)
+    needed = shortfall.sum()
+    if needed > budget:
+        shortfall = shortfall * (budget / needed)
+    buyable = buy_row >= 0
+    buy = np.zeros_like(price)
+    buy[buy_row[buyable]] = _truncate(shortfall[buyable] / price[buy_row[buyable]], step)
+
+    # Dorovnání: zbylou hotovost po zaokrouhlení postupně utratit ve skupinách, které jsou
+    # nejvíc pod cílem (vždy co nejvíc kroků najednou, takže stačí málo iterací)
+    target_value = weights * total
+    group_after = np.bincount(codes, weights=value + (buy + sell) * price, minlength=n_groups)
+    deficit = np.where(buyable, target_value - group_after, -np.inf)
+    unit_cost = np.where(buyable, price[np.maximum(buy_row, 0)] * step, np.inf)
+    left = budget - (buy * price).sum()
+    while True:
+        # Krok má smysl, jen pokud skupinu přiblíží cíli a je na něj hotovost
+        candidates = (deficit >= unit_cost / 2) & (unit_cost <= left)
+        if not candidates.any():
+            break
+        group = np.argmax(np.where(candidates, deficit, -np.inf))
+        steps = max(1.0, np.floor(min(deficit[group], left) / unit_cost[group]))
+        buy[buy_row[group]] += steps * step
+        deficit[group] -= steps * unit_cost[group]
+        left -= steps * unit_cost[group]
+
+    buy = np.where(buy * price < min_order_value, 0.0, buy)
+
+    order_quantity = buy + sell
+    remaining_cash = budget - (buy * price).sum()
+
+    mask = order_quantity != 0
+    # Při by='Název' se druhý klíč sloučí s prvním (sloupec je jen jeden)
+    orders_df = pd.DataFrame({
+        'Název': positions_df['Název'].to_numpy()[mask],
+        by: positions_df[by].to_numpy()[mask],
+        'Příkaz': np.where(order_quantity[mask] > 0, 'BUY', 'SELL'),
+        'Množství': np.abs(order_quantity[mask]),
+        'Cena (USD)': price[mask],
+        'Hodnota (USD)': np.abs(order_quantity[mask]) * price[mask],
+    })
+
+    new_group_value = np.bincount(codes, weights=value + order_quantity * price, minlength=n_groups)
+    invested_before = group_value.sum()
+    invested_after = new_group_value.sum()
+    groups_df = pd.DataFrame({
+        by: groups,
+        'Aktuální %': group_value / invested_before * 100 if invested_before > 0 else 0.0,
+        'Cílová %': weights * 100,
+        'Po rebalancování %': new_group_value / invested_after * 100 if invested_after > 0 else 0.0,
+    })
+    return orders_df, groups_df, remaining_cash
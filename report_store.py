@@ -0,0 +1,84 @@
+import hashlib
+import io
+import types
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from portfolio import load_report, calculate_positions, calculate_total_dividends, build_positions_df
+
+# --- Sdílené, neměnné zpracované reporty ---
+# Report se zpracuje jednou za proces pro každý obsah souboru (klíč = SHA-256 bajtů) a všechny
+# sessions, které nahrají stejný report, sdílí tentýž objekt. Session si drží jen klíč a
+# vlastní manuální korekce cen.
+#
+# Sdílí se jen to, co aplikace po zpracování opravdu čte: statická tabulka pozic a součty.
+# Tabulka je uložená jako numpy pole jen pro čtení (Název jako category, peníze ve float64)
+# a sessions dostávají přes positions_frame() DataFrame nad těmito poli bez kopírování -
+# zápis do něj skončí chybou místo tiché změny dat ostatních sessions.
+
+ParsedReport = namedtuple('ParsedReport', [
+    'key', 'file_name', 'messages',
+    'positions', # {sloupec: pole jen pro čtení}, viz positions_frame()
+    'symbols', 'total_invested', 'total_dividends',
+])
+
+POSITION_VALUE_COLUMNS = ['Množství', 'Průměrná cena (USD)', 'Náklad pozice (USD)']
+
+
+def report_key(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_only(values):
+    values = np.array(values, copy=True)
+    values.flags.writeable = False
+    return values
+
+
+# Převod statické tabulky pozic na sdílená pole jen pro čtení
+def freeze_positions(positions_df):
+    names = pd.Categorical(positions_df['Název'])
+    columns = {'Název': pd.Categorical.from_codes(_read_only(names.codes), names.categories)}
+    for column in POSITION_VALUE_COLUMNS:
+        columns[column] = _read_only(positions_df[column].to_numpy(dtype='float64'))
+    return types.MappingProxyType(columns)
+
+
+# Tabulka pozic reportu pro session - bez kopírování dat, sdílená pole nejdou přepsat
+def positions_frame(report):
+    return pd.DataFrame(dict(report.positions), copy=False)
+
+
+# Zpracování reportu z bajtů (bez cache; používá ho i benchmark)
+# Surové tabulky z reportu se po agregaci zahodí, nic dalšího je nečte.
+def parse_report(data, file_name):
+    df_open, _, df_cash, messages = load_report(io.BytesIO(data), file_name)
+
+    positions = calculate_positions(df_open)
+    total_invested = sum(pos['total_cost'] for pos in positions.values())
+    total_dividends = calculate_total_dividends(df_cash)
+
+    return ParsedReport(
+        key=report_key(data),
+        file_name=file_name,
+        messages=tuple(messages),
+        positions=freeze_positions(build_positions_df(positions)),
+        symbols=tuple(sorted(positions)),
+        total_invested=total_invested,
+        total_dividends=total_dividends,
+    )
+
+
+# Sdílená cache (cache_resource nevrací kopie); _data se nehashuje, klíčem je key
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_report(key, file_name, _data):
+    return parse_report(_data, file_name)
+
+
+# Zpracovaný report pro nahraný soubor (st.file_uploader) - sdílený mezi sessions
+def get_report(uploaded_file):
+    data = uploaded_file.getvalue()
+    return _cached_report(report_key(data), uploaded_file.name, data)
@@ -0,0 +1,31 @@
+"""Spuštění dashboardu s přednačtením cache při startu serveru.
+
+    python serve.py [volby streamlit run, např. --server.port 8501]
+
+Chová se jako `streamlit run app.py`, navíc v pozadí spustí prewarm.py (viz tam pro
+nastavení) a do logu zapíše délku jednotlivých fází studeného startu.
+"""
+import os
+import sys
+
+import startup
+startup.started_by_launcher()
+
+with startup.phase('import streamlit'):
+    from streamlit.web import cli as stcli
+
+import prewarm
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def main():
+    # Přednačtení začne hned při startu serveru (app.py ho pak už znovu nespustí).
+    # Prewarm běží ve stejném procesu jako server, takže plní tutéž st.cache_data
+    prewarm.start_in_background()
+    sys.argv = ['streamlit', 'run', APP_PATH] + sys.argv[1:]
+    sys.exit(stcli.main())
+
+
+if __name__ == '__main__':
+    main()
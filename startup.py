@@ -0,0 +1,70 @@
+import functools
+import os
+import re
+import time
+from contextlib import contextmanager
+
+# --- Studený start: měření fází a jednorázově připravené CSS ---
+# Modul žije po celou dobu procesu serveru (app.py se při každém rerunu spouští znovu),
+# takže se každá fáze zaloguje jen při svém prvním proběhnutí po startu.
+#
+# Hodiny běží od prvního importu tohoto modulu. Při `streamlit run app.py` je to první běh
+# skriptu (start serveru a import Streamlitu v měření nejsou), serve.py ho importuje jako
+# první věc v procesu a přepne popisek přes started_by_launcher().
+
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'style.css')
+
+_phases = {}
+_clock = {'start': time.perf_counter(), 'label': 'od prvního běhu skriptu'}
+
+
+# Logger Streamlitu se načítá až při prvním logování, aby import modulu zůstal bez Streamlitu
+@functools.lru_cache(maxsize=None)
+def logger():
+    from streamlit.logger import get_logger
+    return get_logger('alfa.startup')
+
+
+# Volá serve.py hned po startu procesu - čas se pak vztahuje ke startu procesu
+def started_by_launcher():
+    _clock['label'] = 'od startu procesu'
+
+
+# Změří fázi studeného startu (importy, CSS, přednačtení dat...); opakované běhy se neměří
+@contextmanager
+def phase(name):
+    if name in _phases:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = time.perf_counter() - start
+        logger().info("Cold start: %s %.3f s", name, _phases[name])
+
+
+# Souhrn všech dosud změřených fází do logu
+def log_summary(title):
+    breakdown = ', '.join(f"{name} {seconds:.3f} s" for name, seconds in _phases.items())
+    elapsed = time.perf_counter() - _clock['start']
+    logger().info("%s po %.3f s %s (%s)", title, elapsed, _clock['label'], breakdown)
+
+
+# První vykreslení úvodní stránky (před nahráním reportu) - zaloguje se jednou za proces
+def mark_first_render():
+    if 'first render' not in _phases:
+        _phases['first render'] = time.perf_counter() - _clock['start']
+        log_summary('První vykreslení stránky')
+
+
+# Styl aplikace (assets/style.css) načtený a zmenšený jednou za proces.
+# Streamlit musí <style> poslat při každém běhu skriptu, posíláme ale jen zkrácenou verzi.
+@functools.lru_cache(maxsize=None)
+def app_css():
+    with open(CSS_PATH, encoding='utf-8') as f:
+        css = f.read()
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return f"<style>{css.strip()}</style>"